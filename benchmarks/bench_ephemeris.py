@@ -0,0 +1,65 @@
+# Accuracy and throughput of the Chebyshev ephemeris cache against direct SGP4
+# Run from the repository root: python -m benchmarks.bench_ephemeris
+
+import time
+import numpy as np
+from ephemeris_cache import ChebyshevEphemeris
+from orbit import ecef_state_array, load_satellite, look_angles, look_angles_array
+from benchmarks.bench_pass_finder import SAMPLE_TLE, LAT, LNG, ALT
+
+DAYS = 7
+SAMPLES = 1_000_000
+REPEATS = 5
+
+
+def timed(f, *args):
+    best = float('inf')
+    for _ in range(REPEATS):
+        t0 = time.perf_counter()
+        result = f(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    sat = load_satellite(*SAMPLE_TLE)
+    start = (sat.jdsatepoch - 2440587.5 + sat.jdsatepochF) * 86400
+    end = start + DAYS * 86400
+
+    t0 = time.perf_counter()
+    ephemeris = ChebyshevEphemeris.fit(*SAMPLE_TLE, start, end)
+    print(f"fit {DAYS} days ({len(ephemeris.coeffs)} segments): {time.perf_counter() - t0:.3f} s, "
+          f"{ephemeris.coeffs.nbytes / 1024:.0f} KiB")
+
+    times = np.sort(np.random.default_rng(0).uniform(start, end, SAMPLES))
+    direct_time, (direct_pos, direct_vel) = timed(ecef_state_array, sat, times)
+    cheb_time, (cheb_pos, cheb_vel) = timed(ephemeris.state, times)
+    pos_err = np.linalg.norm(cheb_pos - direct_pos, axis=1)
+    vel_err = np.linalg.norm(cheb_vel - direct_vel, axis=1)
+    print(f"position error: max {pos_err.max() * 1e3:.3f} m, rms {np.sqrt((pos_err ** 2).mean()) * 1e3:.3f} m")
+    print(f"velocity error: max {vel_err.max() * 1e6:.3f} mm/s")
+    print(f"direct SGP4 array: {SAMPLES / direct_time / 1e6:.2f} M states/s")
+    print(f"Chebyshev array:   {SAMPLES / cheb_time / 1e6:.2f} M states/s ({direct_time / cheb_time:.1f}x)")
+
+    _, (_, direct_el, _, direct_rate) = timed(look_angles_array, sat, times, LAT, LNG, ALT)
+    _, (_, cheb_el, _, cheb_rate) = timed(ephemeris.look_angles, times, LAT, LNG, ALT)
+    print(f"elevation error: max {np.abs(cheb_el - direct_el).max() * 3600:.4f} arcsec, "
+          f"range rate error: max {np.abs(cheb_rate - direct_rate).max() * 1e6:.3f} mm/s")
+
+    # Per call: scalar SGP4 once per time, SGP4 array path, Chebyshev
+    crossover = None
+    for batch in (1, 3, 10, 30, 100, 1000, 10000):
+        chunk = times[:batch]
+        scalar_time, _ = timed(lambda: [look_angles(sat, t, LAT, LNG, ALT) for t in chunk])
+        direct_time, _ = timed(look_angles_array, sat, chunk, LAT, LNG, ALT)
+        cheb_time, _ = timed(ephemeris.look_angles, chunk, LAT, LNG, ALT)
+        print(f"batch of {batch:>5}: SGP4 scalar {scalar_time * 1e6:8.1f} us, "
+              f"SGP4 array {direct_time * 1e6:8.1f} us, Chebyshev {cheb_time * 1e6:8.1f} us")
+        if crossover is None and cheb_time < min(scalar_time, direct_time):
+            crossover = batch
+    print(f"crossover: Chebyshev is fastest from {crossover} times per call; "
+          f"use orbit.look_angles for single times")
+
+
+if __name__ == '__main__':
+    main()
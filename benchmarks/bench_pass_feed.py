@@ -0,0 +1,89 @@
+# Scale test for the WebSocket pass feed with many local simulated clients
+# Run from the repository root: python -m benchmarks.bench_pass_feed
+
+import asyncio
+import multiprocessing
+import time
+import aiohttp
+from aiohttp import web
+from orbit import load_satellite, look_angles, orbital_period
+from pass_feed import PassFeed, make_app
+from pass_finder import find_pass_windows
+from benchmarks.bench_pass_finder import SAMPLE_TLE, LAT, LNG, ALT
+
+PORT = 8765
+FRAME_INTERVAL = 0.1
+DURATION = 5.0
+CLIENT_COUNTS = (1, 10, 100, 500, 1000)
+
+
+def sample_satellites():
+    return {33591: ('19', load_satellite(*SAMPLE_TLE), 137100000)}
+
+
+def serve(offset):
+    feed = PassFeed(sample_satellites(), LAT, LNG, ALT, clock=lambda: time.time() + offset,
+                    frame_interval=FRAME_INTERVAL)
+    web.run_app(make_app(feed), host='127.0.0.1', port=PORT, print=None)
+
+
+async def stats(session):
+    async with session.get(f'http://127.0.0.1:{PORT}/stats') as response:
+        return await response.json()
+
+
+async def client(session, received, stop):
+    async with session.ws_connect(f'ws://127.0.0.1:{PORT}/feed') as ws:
+        while time.monotonic() < stop:
+            try:
+                msg = await ws.receive(timeout=max(0.01, stop - time.monotonic()))
+            except asyncio.TimeoutError:
+                break
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                break
+            received.append(len(msg.data))
+
+
+async def measure(n_clients):
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        received = [[] for _ in range(n_clients)]
+        stop = time.monotonic() + DURATION
+        tasks = [asyncio.ensure_future(client(session, r, stop)) for r in received]
+        await asyncio.sleep(1.0)  # let every client connect and take its snapshot
+        before = await stats(session)
+        for r in received:
+            r.clear()
+        await asyncio.gather(*tasks)
+        after = await stats(session)
+    elapsed = DURATION - 1.0
+    frames = after['frames'] - before['frames']
+    per_client = sum(sum(r) for r in received) / n_clients / elapsed
+    compute = (after['compute_seconds'] - before['compute_seconds']) / frames * 1e6
+    publish = (after['publish_seconds'] - before['publish_seconds']) / frames * 1e6
+    cpu = (after['cpu_seconds'] - before['cpu_seconds']) / elapsed * 100
+    encoded = (after['bytes_encoded'] - before['bytes_encoded']) / elapsed
+    print(f"{n_clients:>5} clients: {per_client:5.0f} B/s per client, {encoded:5.0f} B/s encoded, "
+          f"frame compute {compute:4.0f} us, fan-out {publish:5.0f} us, "
+          f"server CPU {cpu:5.1f} % ({cpu / n_clients:.3f} % per client), resyncs {after['resyncs']}")
+
+
+def main():
+    sat = load_satellite(*SAMPLE_TLE)
+    epoch = (sat.jdsatepoch - 2440587.5 + sat.jdsatepochF) * 86400
+    aos, _, _ = find_pass_windows(lambda t: look_angles(sat, t, LAT, LNG, ALT)[1],
+                                  epoch, epoch + 86400, orbital_period(sat), 10)[0]
+    # Shift the feed clock so a pass is in progress for the whole run
+    offset = aos + 60 - time.time()
+    server = multiprocessing.Process(target=serve, args=(offset,), daemon=True)
+    server.start()
+    time.sleep(2.0)
+    try:
+        for n_clients in CLIENT_COUNTS:
+            asyncio.run(measure(n_clients))
+    finally:
+        server.terminate()
+
+
+if __name__ == '__main__':
+    main()
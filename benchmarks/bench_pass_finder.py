@@ -0,0 +1,59 @@
+# Compare the coarse-to-fine pass finder against a dense 1-second elevation grid
+# Run from the repository root: python -m benchmarks.bench_pass_finder
+
+import time
+from orbit import load_satellite, look_angles, orbital_period
+from pass_finder import find_pass_windows
+
+SAMPLE_TLE = ('1 33591U 09005A   24100.51462315  .00000189  00000-0  12613-3 0  9991',
+              '2 33591  99.0461 132.3036 0013451 302.9690  57.0184 14.12997452786498')
+LAT, LNG, ALT = 39.9216, -75.1812, 12
+DAYS = 2
+MIN_EL = 10
+
+
+def dense_windows(elevation, start, end, step=1.0):
+    windows, aos, best = [], None, None
+    t, prev = start, elevation(start) - MIN_EL
+    while t < end:
+        t += step
+        value = elevation(t) - MIN_EL
+        if prev <= 0 < value:
+            aos, best = t, (value, t)
+        elif aos is not None and value > 0 and value > best[0]:
+            best = (value, t)
+        elif aos is not None and prev > 0 >= value:
+            windows.append((aos, best[1], t))
+            aos = None
+        prev = value
+    return windows
+
+
+def main():
+    sat = load_satellite(*SAMPLE_TLE)
+    start = (sat.jdsatepoch - 2440587.5 + sat.jdsatepochF) * 86400
+    end = start + DAYS * 86400
+    calls = [0]
+
+    def elevation(t):
+        calls[0] += 1
+        return look_angles(sat, t, LAT, LNG, ALT)[1]
+
+    t0 = time.perf_counter()
+    fast = find_pass_windows(elevation, start, end, orbital_period(sat), MIN_EL)
+    fast_time, fast_calls = time.perf_counter() - t0, calls[0]
+
+    calls[0] = 0
+    t0 = time.perf_counter()
+    dense = dense_windows(elevation, start, end)
+    dense_time, dense_calls = time.perf_counter() - t0, calls[0]
+
+    print(f"coarse-to-fine: {len(fast)} passes, {fast_calls} evaluations, {fast_time:.3f} s")
+    print(f"1 s grid:       {len(dense)} passes, {dense_calls} evaluations, {dense_time:.3f} s")
+    print(f"evaluation ratio: {dense_calls / fast_calls:.0f}x")
+    for (aos, tca, los), (d_aos, d_tca, d_los) in zip(fast, dense):
+        print(f"  AOS {aos - d_aos:+.2f} s  TCA {tca - d_tca:+.2f} s  LOS {los - d_los:+.2f} s")
+
+
+if __name__ == '__main__':
+    main()
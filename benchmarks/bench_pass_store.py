@@ -0,0 +1,77 @@
+# Query cost of the pass store, checked against brute force
+# Run from the repository root: python -m benchmarks.bench_pass_store
+
+import time
+import numpy as np
+from pass_store import PassStore
+
+PASSES = 500_000
+SATELLITES = 200
+SPAN = 365 * 86400.0
+QUERIES = 10_000
+CHECKS = 500
+
+
+def synthetic_passes(rng, n):
+    aos = rng.uniform(0, SPAN, n)
+    return {'norad_id': rng.integers(10000, 10000 + SATELLITES, n), 'aos': aos,
+            'tca': aos + 300, 'los': aos + rng.uniform(60, 960, n),
+            'max_el': rng.uniform(0, 90, n), 'start_az': rng.uniform(0, 360, n),
+            'max_az': rng.uniform(0, 360, n), 'end_az': rng.uniform(0, 360, n)}
+
+
+def check(store, columns, rng):
+    aos, los, norad_id = columns['aos'], columns['los'], columns['norad_id']
+    for t in rng.uniform(0, SPAN, CHECKS):
+        assert sorted(store.aos[store.active_at(t)]) == sorted(aos[(aos <= t) & (los > t)])
+        t1 = t + rng.uniform(0, 7200)
+        assert sorted(store.aos[store.overlapping(t, t1)]) == sorted(aos[(aos <= t1) & (los >= t)])
+        sat = int(rng.choice(norad_id))
+        i = store.next_pass(sat, t)
+        later = aos[(norad_id == sat) & (aos >= t)]
+        assert (i is None and not len(later)) or store.aos[i] == later.min()
+
+
+def timed_queries(store, rng):
+    times = rng.uniform(0, SPAN, QUERIES)
+    sats = rng.integers(10000, 10000 + SATELLITES, QUERIES).tolist()
+    result = []
+    for query in (lambda t, s: store.active_at(t), lambda t, s: store.overlapping(t, t + 3600),
+                  lambda t, s: store.next_pass(s, t)):
+        t0 = time.perf_counter()
+        for t, s in zip(times, sats):
+            query(t, s)
+        result.append((time.perf_counter() - t0) / QUERIES * 1e6)
+    return result
+
+
+def report(label, store, columns, rng):
+    check(store, columns, rng)
+    active, overlapping, next_pass = timed_queries(store, rng)
+    print(f"{label:<28} active_at {active:5.1f} us, overlapping(1 h) {overlapping:5.1f} us, "
+          f"next_pass {next_pass:5.1f} us  (brute-force check passed)")
+
+
+def main():
+    rng = np.random.default_rng(0)
+    columns = synthetic_passes(rng, PASSES)
+    t0 = time.perf_counter()
+    store = PassStore(**columns)
+    print(f"built {len(store)} passes in {time.perf_counter() - t0:.3f} s")
+    report("LEO passes", store, columns, rng)
+
+    # One 30-day pass (a GEO satellite or a bad row) must not slow down every query
+    columns = {name: np.append(values, values[0]) for name, values in columns.items()}
+    columns['los'][-1] = columns['aos'][-1] + 30 * 86400
+    report("plus one 30-day pass", PassStore(**columns), columns, rng)
+
+    # Rows without a usable LOS are dropped instead of poisoning the index
+    broken = dict(columns, los=columns['los'].copy())
+    broken['los'][0] = np.nan
+    store = PassStore(**broken)
+    valid = {name: values[1:] for name, values in broken.items()}
+    report(f"plus one NaN row ({store.dropped} dropped)", store, valid, rng)
+
+
+if __name__ == '__main__':
+    main()
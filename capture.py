@@ -0,0 +1,131 @@
+# Capture orchestrator: starts an SDR recording command for each scheduled pass
+# at AOS minus a pre-roll and stops it at LOS, sharing a pool of SDR devices.
+# Run: python capture.py --devices 0 1 --hours 12 --command "satdump live noaa_apt {output} ..."
+
+import argparse
+import asyncio
+import datetime
+import os
+import shlex
+import signal
+import string
+import time
+from station import NORAD_IDS, SAT_FREQUENCIES, LAT, LNG, ALT, frequency_hz
+
+DEFAULT_COMMAND = ('satdump live noaa_apt {output} --source rtlsdr --source_id {device} '
+                   '--samplerate 1.024e6 --frequency {frequency_hz} --timeout {duration}')
+PRE_ROLL = 30  # seconds
+POST_ROLL = 0
+STOP_GRACE = 5  # seconds between SIGTERM and SIGKILL
+TEMPLATE_EXAMPLE = {'satellite': '19', 'device': '0', 'output': 'captures/NOAA19', 'duration': 900,
+                    'frequency': '137.100 MHz', 'frequency_hz': 137100000}
+
+
+class CaptureOrchestrator:
+    def __init__(self, command, devices, pre_roll=PRE_ROLL, post_roll=POST_ROLL,
+                 output_dir='captures', stop_grace=STOP_GRACE):
+        self.command = command
+        self.fields = {name for _, name, _, _ in string.Formatter().parse(command) if name}
+        try:
+            args = shlex.split(command.format(**TEMPLATE_EXAMPLE))
+        except (KeyError, IndexError, ValueError) as e:
+            raise ValueError(f"Invalid capture command template {command!r}: {e!r}") from e
+        if not args:
+            raise ValueError("Capture command template is empty")
+        self.devices = list(devices)
+        self.pre_roll, self.post_roll = pre_roll, post_roll
+        self.output_dir = output_dir
+        self.stop_grace = stop_grace
+
+    async def run(self, passes):
+        # passes: dicts with 'satellite', 'frequency', 'startUTC', 'endUTC'
+        pool = asyncio.Queue()
+        for device in self.devices:
+            pool.put_nowait(device)
+        os.makedirs(self.output_dir, exist_ok=True)
+        ordered = sorted(passes, key=lambda p: p['startUTC'])
+        results = []
+        await asyncio.gather(*(self.capture(p, pool, results) for p in ordered))
+        return results
+
+    async def capture(self, p, pool, results):
+        start = p['startUTC'] - self.pre_roll
+        stop = p['endUTC'] + self.post_roll
+        result = {'satellite': p['satellite'], 'start': start, 'stop': stop,
+                  'device': None, 'started': None, 'returncode': None, 'status': 'skipped'}
+        results.append(result)
+        await asyncio.sleep(max(0, start - time.time()))
+        try:
+            device = await asyncio.wait_for(pool.get(), timeout=max(0, stop - time.time()))
+        except asyncio.TimeoutError:
+            return result
+        try:
+            result['device'] = device
+            remaining = stop - time.time()
+            if remaining <= 0:
+                return result
+            proc = await self.start_process(p, device, int(remaining))
+            result['status'] = 'running'
+            result['started'] = time.time()
+            try:
+                result['returncode'] = await asyncio.wait_for(proc.wait(), timeout=remaining)
+                result['status'] = 'completed' if result['returncode'] == 0 else 'failed'
+            except asyncio.TimeoutError:
+                result['returncode'] = await self.stop_process(proc)
+                result['status'] = 'stopped'
+            except asyncio.CancelledError:
+                result['returncode'] = await self.stop_process(proc)
+                result['status'] = 'cancelled'
+                raise
+        except (OSError, ValueError) as e:
+            result['status'] = f"failed: {e}"
+        finally:
+            pool.put_nowait(device)
+        return result
+
+    async def start_process(self, p, device, duration):
+        stamp = datetime.datetime.fromtimestamp(p['startUTC'], tz=datetime.timezone.utc)
+        output = os.path.join(self.output_dir,
+                              f"NOAA{p['satellite']}_{stamp.strftime('%Y%m%d_%H%M%S')}")
+        values = {'satellite': p['satellite'], 'device': device, 'output': output,
+                  'duration': duration, 'frequency': p.get('frequency', '')}
+        if 'frequency_hz' in self.fields:
+            values['frequency_hz'] = frequency_hz(values['frequency'])
+        args = shlex.split(self.command.format(**values))
+        return await asyncio.create_subprocess_exec(*args, stdout=asyncio.subprocess.DEVNULL,
+                                                    stderr=asyncio.subprocess.DEVNULL)
+
+    async def stop_process(self, proc):
+        if proc.returncode is None:
+            proc.send_signal(signal.SIGTERM)
+            try:
+                return await asyncio.wait_for(proc.wait(), timeout=self.stop_grace)
+            except asyncio.TimeoutError:
+                proc.kill()
+        return await proc.wait()
+
+
+def upcoming_passes(hours, min_el):
+    from orbit import fetch_tle, load_satellite
+    from pass_finder import predict_passes
+    passes = []
+    for short_id, norad_id in NORAD_IDS.items():
+        sat = load_satellite(*fetch_tle(norad_id))
+        for p in predict_passes(sat, LAT, LNG, ALT, time.time(), hours / 24, min_el):
+            passes.append(dict(p, satellite=short_id, frequency=SAT_FREQUENCIES[short_id]))
+    return passes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Record scheduled NOAA passes with SDR devices")
+    parser.add_argument('--command', default=DEFAULT_COMMAND)
+    parser.add_argument('--devices', nargs='+', default=['0'])
+    parser.add_argument('--hours', type=float, default=12)
+    parser.add_argument('--min-el', type=float, default=20)
+    parser.add_argument('--pre-roll', type=float, default=PRE_ROLL)
+    parser.add_argument('--output-dir', default='captures')
+    args = parser.parse_args()
+    orchestrator = CaptureOrchestrator(args.command, args.devices, args.pre_roll,
+                                       output_dir=args.output_dir)
+    for r in asyncio.run(orchestrator.run(upcoming_passes(args.hours, args.min_el))):
+        print(f"NOAA {r['satellite']} on {r['device']}: {r['status']} ({r['returncode']})")
@@ -0,0 +1,138 @@
+# Piecewise Chebyshev ephemeris cache
+# SGP4 is run once at Chebyshev nodes of fixed-length segments and the ECEF
+# position is stored as polynomial coefficients. Any array of times is then
+# evaluated with a vectorized Clenshaw recurrence, or for small batches one
+# gather and Vandermonde product; velocity comes from the derivative series. Fits are saved as .npz next to the elements they came from
+# and refitted when the elements change or the requested window is not covered.
+
+import os
+import tempfile
+import zipfile
+import numpy as np
+from numpy.polynomial import chebyshev
+from orbit import ecef_state_array, load_satellite, topocentric
+
+SEGMENT = 600.0  # seconds
+DEGREE = 8
+SMALL_BATCH = 4096  # times per call below which one gather beats per-degree Clenshaw steps
+CACHE_DIR = 'ephemeris'
+
+
+def clenshaw(coeffs, index, x):
+    # coeffs: (3, degree + 1, segments); evaluates segment index[i] at x[i] in [-1, 1]
+    out = np.empty((len(x), coeffs.shape[0]))
+    x2 = 2 * x
+    for c, series in enumerate(coeffs):
+        b1, b2 = np.zeros(len(x)), np.zeros(len(x))
+        for k in range(series.shape[0] - 1, 0, -1):
+            b = series[k].take(index)
+            b += x2 * b1
+            b -= b2
+            b1, b2 = b, b1
+        out[:, c] = series[0].take(index) + x * b1 - b2
+    return out
+
+
+class ChebyshevEphemeris:
+    def __init__(self, line1, line2, start, segment, coeffs):
+        self.line1, self.line2 = line1, line2
+        self.start, self.segment = float(start), float(segment)
+        self.coeffs = coeffs
+        self.degree = coeffs.shape[1] - 1
+        # Component-major copies so each Clenshaw step gathers from one contiguous row;
+        # velocity uses d/dt = d/dx * 2 / segment
+        derivative = chebyshev.chebder(coeffs, axis=1) * (2 / self.segment)
+        self._position = np.ascontiguousarray(coeffs.transpose(2, 1, 0))
+        self._velocity = np.ascontiguousarray(derivative.transpose(2, 1, 0))
+        # Segment-major position and padded velocity series side by side for small batches
+        self._state = np.concatenate((coeffs, np.pad(derivative, ((0, 0), (0, 1), (0, 0)))),
+                                     axis=2)
+
+    @property
+    def end(self):
+        return self.start + self.segment * len(self.coeffs)
+
+    @classmethod
+    def fit(cls, line1, line2, start, end, segment=SEGMENT, degree=DEGREE):
+        n_segments = max(1, int(np.ceil((end - start) / segment)))
+        nodes = np.cos(np.pi * (np.arange(degree + 1) + 0.5) / (degree + 1))
+        times = start + (np.arange(n_segments)[:, None] + (nodes + 1) / 2) * segment
+        position = ecef_state_array(load_satellite(line1, line2), times.ravel())[0]
+        failed = ~np.isfinite(position).all(axis=1)
+        if failed.any():
+            raise ValueError(f"SGP4 failed at {failed.sum()} fit nodes from t={times.ravel()[failed][0]}")
+        solve = np.linalg.pinv(chebyshev.chebvander(nodes, degree))
+        coeffs = np.einsum('kj,sjc->skc', solve, position.reshape(n_segments, degree + 1, 3))
+        return cls(line1, line2, start, segment, coeffs)
+
+    def save(self, path):
+        # Written beside the target and renamed over it, so readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, line1=self.line1, line2=self.line2, start=self.start,
+                         segment=self.segment, coeffs=self.coeffs)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            return cls(str(f['line1']), str(f['line2']), f['start'], f['segment'], f['coeffs'])
+
+    def _locate(self, times):
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+        if times.size and (times.min() < self.start or times.max() > self.end):
+            raise ValueError("Requested times fall outside the fitted ephemeris window")
+        u = (times - self.start) / self.segment
+        index = np.minimum(u.astype(int), len(self.coeffs) - 1)
+        return index, 2 * (u - index) - 1
+
+    def _evaluate(self, times, velocity):
+        index, x = self._locate(times)
+        if len(x) < SMALL_BATCH:
+            state = np.einsum('nk,nkc->nc', chebyshev.chebvander(x, self.degree),
+                              self._state[index])
+            return state[:, :3], state[:, 3:]
+        return (clenshaw(self._position, index, x),
+                clenshaw(self._velocity, index, x) if velocity else None)
+
+    def position(self, times):
+        # (n, 3) km for an array of times, (3,) for a scalar time
+        position = self._evaluate(times, False)[0]
+        return position[0] if np.ndim(times) == 0 else position
+
+    def state(self, times):
+        position, velocity = self._evaluate(times, True)
+        if np.ndim(times) == 0:
+            return position[0], velocity[0]
+        return position, velocity
+
+    def look_angles(self, times, lat, lng, alt):
+        # Scalars for a scalar time, like orbit.look_angles
+        position, velocity = self.state(times)
+        return topocentric(*position.T, *velocity.T, lat, lng, alt)
+
+
+def cache_path(line1, cache_dir=CACHE_DIR):
+    # Catalog number and element epoch identify the element set
+    return os.path.join(cache_dir, f"{line1[2:7].strip()}_{line1[18:32].strip()}.npz")
+
+
+def load_or_fit(line1, line2, start, end, cache_dir=CACHE_DIR):
+    path = cache_path(line1, cache_dir)
+    try:
+        cached = ChebyshevEphemeris.load(path)
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+        cached = None  # missing or unreadable: refit
+    if cached is not None and (cached.line1, cached.line2) == (line1, line2):
+        if cached.start <= start and end <= cached.end:
+            return cached
+        # Extend rather than replace, so a narrow request keeps the wider fit
+        start, end = min(start, cached.start), max(end, cached.end)
+    ephemeris = ChebyshevEphemeris.fit(line1, line2, start, end)
+    os.makedirs(cache_dir, exist_ok=True)
+    ephemeris.save(path)
+    return ephemeris
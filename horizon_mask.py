@@ -0,0 +1,75 @@
+# Per-azimuth horizon mask applied to sampled pass tracks
+# Tracks are propagated once down to the true horizon; any mask or minimum
+# elevation can then be re-applied to every sample in one vectorized pass.
+#
+# Mask file: one "azimuth elevation" pair per line (degrees, comma or space
+# separated, '#' comments). Points are interpolated linearly and wrap at 360.
+
+from collections import namedtuple
+import numpy as np
+from ephemeris_cache import load_or_fit
+from orbit import look_angles, look_angles_array, orbital_period
+from pass_finder import find_pass_windows
+
+SAMPLE_STEP = 1.0  # seconds
+
+PassTracks = namedtuple('PassTracks', 'times az el offsets step')
+MaskedPasses = namedtuple('MaskedPasses', 'aos los duration max_el')
+
+
+def load_horizon_mask(path):
+    points = []
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            fields = line.split('#', 1)[0].replace(',', ' ').split()
+            if not fields:
+                continue
+            try:
+                points.append((float(fields[0]) % 360, float(fields[1])))
+            except (IndexError, ValueError):
+                raise ValueError(f"{path}:{number}: expected 'azimuth elevation', "
+                                 f"got {line.strip()!r}") from None
+    if not points:
+        raise ValueError(f"No horizon mask points in {path}")
+    points.sort()
+    return np.array(points).T
+
+
+def flat_mask(el):
+    return np.array([[0.0], [float(el)]])
+
+
+def sample_pass_tracks(sat, lat, lng, alt, start, end, step=SAMPLE_STEP, tle=None):
+    # tle: the (line1, line2) sat was loaded from; when given, the dense samples are
+    # evaluated on the cached Chebyshev ephemeris instead of SGP4
+    def elevation(t):
+        return look_angles(sat, t, lat, lng, alt)[1]
+
+    windows = find_pass_windows(elevation, start, end, orbital_period(sat), 0.0)
+    chunks = [np.append(np.arange(aos, los, step), los) for aos, _, los in windows]
+    offsets = np.cumsum([0] + [len(c) for c in chunks])
+    times = np.concatenate(chunks) if chunks else np.empty(0)
+    if tle is not None and len(times):
+        ephemeris = load_or_fit(*tle, times[0], times[-1])
+        az, el = ephemeris.look_angles(times, lat, lng, alt)[:2]
+    else:
+        az, el = look_angles_array(sat, times, lat, lng, alt)[:2]
+    return PassTracks(times, az, el, offsets, step)
+
+
+def apply_horizon_mask(tracks, mask, min_el=0.0):
+    # Effective AOS/LOS (nan when never clear), clear time in seconds and max clear elevation
+    if len(tracks.offsets) < 2:
+        empty = np.empty(0)
+        return MaskedPasses(empty, empty, empty, empty)
+    mask_az, mask_el = mask
+    limit = np.maximum(np.interp(tracks.az, mask_az, mask_el, period=360), min_el)
+    visible = tracks.el > limit
+    starts = tracks.offsets[:-1]
+    aos = np.minimum.reduceat(np.where(visible, tracks.times, np.inf), starts)
+    los = np.maximum.reduceat(np.where(visible, tracks.times, -np.inf), starts)
+    max_el = np.maximum.reduceat(np.where(visible, tracks.el, -np.inf), starts)
+    duration = np.add.reduceat(visible, starts) * tracks.step
+    never = ~np.isfinite(aos)
+    aos[never] = los[never] = max_el[never] = np.nan
+    return MaskedPasses(aos, los, duration, max_el)
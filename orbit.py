@@ -0,0 +1,125 @@
+# Local SGP4 propagation and topocentric look angles
+# Powered by CelesTrak elements and the sgp4 package
+
+import math
+import numpy as np
+import requests
+from sgp4.api import Satrec
+
+TLE_URL = 'https://celestrak.org/NORAD/elements/gp.php?CATNR={norad_id}&FORMAT=tle'
+WGS84_A = 6378.137
+WGS84_E2 = 6.69437999014e-3
+EARTH_ROTATION = 7.292115e-5  # rad/s
+UNIX_EPOCH_JD = 2440587.5
+COMPASS_POINTS = ['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE',
+                  'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW']
+
+
+def fetch_tle(norad_id):
+    response = requests.get(TLE_URL.format(norad_id=norad_id), timeout=10)
+    response.raise_for_status()
+    lines = [line.strip() for line in response.text.splitlines() if line.strip()]
+    if len(lines) < 2:
+        raise ValueError(f"No elements returned for NORAD {norad_id}")
+    return lines[-2], lines[-1]
+
+
+def load_satellite(line1, line2):
+    return Satrec.twoline2rv(line1, line2)
+
+
+def orbital_period(sat):
+    # no_kozai is the mean motion in rad/min
+    return 2 * math.pi / sat.no_kozai * 60
+
+
+def unix_to_jd(t):
+    # Split into whole days and fraction before adding the epoch to keep sub-ms precision
+    days = t / 86400.0
+    whole = math.floor(days)
+    return whole + UNIX_EPOCH_JD, days - whole
+
+
+def gmst(jd, fr):
+    # IAU 1982 sidereal time, radians
+    t = (jd - 2451545.0 + fr) / 36525.0
+    seconds = (67310.54841 + (876600.0 * 3600 + 8640184.812866) * t
+               + 0.093104 * t * t - 6.2e-6 * t * t * t)
+    return math.radians((seconds % 86400.0) / 240.0)
+
+
+def azimuth_compass(az):
+    return COMPASS_POINTS[int((az % 360) / 22.5 + 0.5) % 16]
+
+
+def station_ecef(lat, lng, alt):
+    phi, lam = math.radians(lat), math.radians(lng)
+    h = alt / 1000.0
+    n = WGS84_A / math.sqrt(1 - WGS84_E2 * math.sin(phi) ** 2)
+    return ((n + h) * math.cos(phi) * math.cos(lam),
+            (n + h) * math.cos(phi) * math.sin(lam),
+            (n * (1 - WGS84_E2) + h) * math.sin(phi))
+
+
+def ecef_state(sat, t):
+    jd, fr = unix_to_jd(t)
+    err, r, v = sat.sgp4(jd, fr)
+    if err:
+        raise ValueError(f"SGP4 error {err} at t={t}")
+    g = gmst(jd, fr)
+    c, s = math.cos(g), math.sin(g)
+    x, y = c * r[0] + s * r[1], -s * r[0] + c * r[1]
+    vx = c * v[0] + s * v[1] + EARTH_ROTATION * y
+    vy = -s * v[0] + c * v[1] - EARTH_ROTATION * x
+    return (x, y, r[2]), (vx, vy, v[2])
+
+
+def topocentric(x, y, z, vx, vy, vz, lat, lng, alt):
+    # ECEF state (scalars or arrays) to azimuth, elevation, range and range rate
+    sx, sy, sz = station_ecef(lat, lng, alt)
+    dx, dy, dz = x - sx, y - sy, z - sz
+    phi, lam = math.radians(lat), math.radians(lng)
+    sin_phi, cos_phi = math.sin(phi), math.cos(phi)
+    sin_lam, cos_lam = math.sin(lam), math.cos(lam)
+    east = -sin_lam * dx + cos_lam * dy
+    north = -sin_phi * cos_lam * dx - sin_phi * sin_lam * dy + cos_phi * dz
+    up = cos_phi * cos_lam * dx + cos_phi * sin_lam * dy + sin_phi * dz
+    rng = np.sqrt(dx * dx + dy * dy + dz * dz)
+    az = np.degrees(np.arctan2(east, north)) % 360
+    el = np.degrees(np.arctan2(up, np.hypot(east, north)))
+    return az, el, rng, (dx * vx + dy * vy + dz * vz) / rng
+
+
+def look_angles(sat, t, lat, lng, alt):
+    # Returns azimuth and elevation in degrees, range in km and range rate in km/s
+    (x, y, z), (vx, vy, vz) = ecef_state(sat, t)
+    return topocentric(x, y, z, vx, vy, vz, lat, lng, alt)
+
+
+def ecef_state_array(sat, times):
+    # Vectorized ecef_state; rows where SGP4 fails are nan
+    times = np.asarray(times, dtype=float)
+    days = times / 86400.0
+    whole = np.floor(days)
+    fr = days - whole
+    whole += UNIX_EPOCH_JD
+    err, r, v = sat.sgp4_array(whole, fr)
+    t = (whole - 2451545.0 + fr) / 36525.0
+    seconds = (67310.54841 + (876600.0 * 3600 + 8640184.812866) * t
+               + 0.093104 * t * t - 6.2e-6 * t * t * t)
+    g = np.radians((seconds % 86400.0) / 240.0)
+    c, s = np.cos(g), np.sin(g)
+    x, y = c * r[:, 0] + s * r[:, 1], -s * r[:, 0] + c * r[:, 1]
+    vx = c * v[:, 0] + s * v[:, 1] + EARTH_ROTATION * y
+    vy = -s * v[:, 0] + c * v[:, 1] - EARTH_ROTATION * x
+    position = np.column_stack((x, y, r[:, 2]))
+    velocity = np.column_stack((vx, vy, v[:, 2]))
+    bad = err != 0
+    position[bad] = velocity[bad] = np.nan
+    return position, velocity
+
+
+def look_angles_array(sat, times, lat, lng, alt):
+    # Vectorized look_angles over an array of unix times
+    position, velocity = ecef_state_array(sat, times)
+    return topocentric(*position.T, *velocity.T, lat, lng, alt)
@@ -0,0 +1,228 @@
+# WebSocket push feed of the pass table and live az/el/Doppler for active passes
+# Each tick computes one delta for everybody, encodes it once and fans the same
+# string out to every subscriber. New or lagging clients get a full snapshot.
+# Run: python pass_feed.py --port 8090   (clients connect to ws://host:8090/feed)
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+import requests
+from aiohttp import web, WSMsgType
+from orbit import fetch_tle, load_satellite, look_angles
+from pass_finder import predict_passes
+from pass_store import PassStore
+from station import NORAD_IDS, SAT_FREQUENCIES, LAT, LNG, ALT, DAYS, MIN_EL, frequency_hz
+
+FRAME_INTERVAL = 1.0  # seconds
+PASS_REFRESH = 15 * 60  # seconds
+PASS_LOOKBACK = 30 * 60  # predict from before now so passes in progress stay in the table
+PASS_MATCH = 60  # seconds; re-predicted passes within this of a published one keep its row
+QUEUE_SIZE = 8  # frames buffered per client before it is resynced
+SPEED_OF_LIGHT = 299792.458  # km/s
+
+log = logging.getLogger(__name__)
+
+
+def pass_key(norad_id, p):
+    return f"{norad_id}:{int(p['startUTC'])}"
+
+
+class PassFeed:
+    def __init__(self, satellites, lat=LAT, lng=LNG, alt=ALT, clock=time.time,
+                 days=DAYS, min_el=MIN_EL, frame_interval=FRAME_INTERVAL, elements=None):
+        # satellites: {norad_id: (name, satrec, frequency in Hz)}; elements, if given, is
+        # called on every pass refresh to return the same mapping built from fresh TLEs
+        self.satellites = satellites
+        self.elements = elements
+        self.lat, self.lng, self.alt = lat, lng, alt
+        self.clock = clock
+        self.days, self.min_el = days, min_el
+        self.frame_interval = frame_interval
+        self.subscribers = {}
+        self.seq = 0
+        self.passes = {}
+        self.live = {}
+        self.store = PassStore.from_passes([])
+        self.refreshed_at = None
+        self._refresh = None
+        self._snapshot = (None, None)
+        self.stats = {'frames': 0, 'compute_seconds': 0.0, 'publish_seconds': 0.0,
+                      'bytes_encoded': 0, 'resyncs': 0}
+
+    def refresh(self, now):
+        # Runs in a worker thread: reload elements, then search every satellite for passes
+        satellites = self.satellites
+        if self.elements is not None:
+            try:
+                satellites = self.elements()
+            except (requests.RequestException, ValueError) as e:
+                log.warning("Keeping previous elements: %s", e)
+        rows = []
+        for norad_id, (name, sat, _) in satellites.items():
+            for p in predict_passes(sat, self.lat, self.lng, self.alt, now - PASS_LOOKBACK,
+                                    self.days, self.min_el):
+                if p['endUTC'] >= now:
+                    rows.append((norad_id, dict(p, satellite=name, key=pass_key(norad_id, p))))
+        return satellites, rows
+
+    def apply_refresh(self, satellites, rows):
+        merged = []
+        for norad_id, row in rows:
+            # Keep the published row when a refresh only nudges the pass times
+            for old in self.passes.values():
+                if old['satellite'] == row['satellite'] \
+                        and abs(old['startUTC'] - row['startUTC']) < PASS_MATCH:
+                    row = old
+                    break
+            merged.append((norad_id, row))
+        self.satellites = satellites
+        self.store = PassStore.from_passes(merged)
+        return {p['key']: p for _, p in merged}
+
+    def step(self, now, refreshed=None):
+        # Advance to `now` and return the delta from the previous frame (empty dict if none);
+        # refreshed is a result of refresh() to swap in
+        delta = {}
+        source = self.apply_refresh(*refreshed) if refreshed is not None else self.passes
+        current = {k: p for k, p in source.items() if p['endUTC'] >= now}
+        added = [p for k, p in current.items() if k not in self.passes]
+        removed = [k for k in self.passes if k not in current]
+        self.passes = current
+        if added or removed:
+            delta['passes'] = {'add': added, 'remove': removed}
+
+        live = {}
+        for i in self.store.active_at(now):
+            norad_id = int(self.store.norad_id[i])
+            _, sat, freq = self.satellites[norad_id]
+            az, el, _, range_rate = look_angles(sat, now, self.lat, self.lng, self.alt)
+            live[str(norad_id)] = {'az': round(float(az), 1), 'el': round(float(el), 1),
+                                   'range_rate': round(float(range_rate) * 1000),
+                                   'doppler': round(-freq * float(range_rate) / SPEED_OF_LIGHT)}
+        changed = {}
+        for norad_id, state in live.items():
+            previous = self.live.get(norad_id, {})
+            fields = {f: v for f, v in state.items() if previous.get(f) != v}
+            if fields:
+                changed[norad_id] = fields
+        gone = [norad_id for norad_id in self.live if norad_id not in live]
+        self.live = live
+        if changed or gone:
+            delta['live'] = {'set': changed, 'remove': gone}
+        if delta:
+            self.seq += 1
+            delta.update(type='delta', seq=self.seq, time=now)
+        return delta
+
+    def snapshot(self):
+        # Encoded once per sequence number and shared by every client that needs it
+        if self._snapshot[0] != self.seq:
+            message = {'type': 'snapshot', 'seq': self.seq, 'passes': list(self.passes.values()),
+                       'live': self.live}
+            self._snapshot = (self.seq, json.dumps(message, separators=(',', ':')))
+        return self._snapshot[1]
+
+    def resync(self, queue):
+        # Replace a client's backlog with a fresh snapshot
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(self.snapshot())
+        self.stats['resyncs'] += 1
+
+    def publish(self, message):
+        for queue in self.subscribers.values():
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self.resync(queue)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        next_frame = loop.time()
+        while True:
+            now = self.clock()
+            refreshed = None
+            if self._refresh is None:
+                if self.refreshed_at is None or now - self.refreshed_at >= PASS_REFRESH:
+                    # Pass search and TLE download stay off the event loop
+                    self.refreshed_at = now
+                    self._refresh = asyncio.ensure_future(asyncio.to_thread(self.refresh, now))
+            elif self._refresh.done():
+                try:
+                    refreshed = self._refresh.result()
+                except Exception:
+                    log.exception("Pass refresh failed")
+                self._refresh = None
+            started = time.process_time()
+            delta = self.step(now, refreshed)
+            if delta:
+                message = json.dumps(delta, separators=(',', ':'))
+                self.stats['bytes_encoded'] += len(message)
+                encoded = time.process_time()
+                self.publish(message)
+                self.stats['publish_seconds'] += time.process_time() - encoded
+                self.stats['compute_seconds'] += encoded - started
+            else:
+                self.stats['compute_seconds'] += time.process_time() - started
+            self.stats['frames'] += 1
+            next_frame += self.frame_interval
+            await asyncio.sleep(max(0, next_frame - loop.time()))
+
+    async def writer(self, ws, queue):
+        try:
+            while True:
+                await ws.send_str(await queue.get())
+        except ConnectionResetError:
+            pass
+
+    async def handle_feed(self, request):
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        queue = asyncio.Queue(QUEUE_SIZE)
+        queue.put_nowait(self.snapshot())
+        self.subscribers[ws] = queue
+        writer = asyncio.ensure_future(self.writer(ws, queue))
+        try:
+            async for msg in ws:
+                if msg.type == WSMsgType.TEXT and msg.data == 'resync':
+                    self.resync(queue)
+        finally:
+            del self.subscribers[ws]
+            writer.cancel()
+        return ws
+
+    async def handle_stats(self, request):
+        return web.json_response(dict(self.stats, subscribers=len(self.subscribers),
+                                      seq=self.seq, cpu_seconds=time.process_time()))
+
+
+def make_app(feed):
+    async def start(app):
+        app['feed_task'] = asyncio.ensure_future(feed.run())
+
+    async def stop(app):
+        app['feed_task'].cancel()
+
+    app = web.Application()
+    app.router.add_get('/feed', feed.handle_feed)
+    app.router.add_get('/stats', feed.handle_stats)
+    app.on_startup.append(start)
+    app.on_cleanup.append(stop)
+    return app
+
+
+def noaa_satellites():
+    return {norad_id: (short_id, load_satellite(*fetch_tle(norad_id)),
+                       frequency_hz(SAT_FREQUENCIES[short_id]))
+            for short_id, norad_id in NORAD_IDS.items()}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Push live pass state to WebSocket clients")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    args = parser.parse_args()
+    feed = PassFeed(noaa_satellites(), elements=noaa_satellites)
+    web.run_app(make_app(feed), host=args.host, port=args.port)
@@ -0,0 +1,98 @@
+# Local replacement for the N2YO radiopasses endpoint
+# Coarse orbit-aware stepping brackets horizon crossings, then bisection
+# refines AOS/LOS and golden-section search refines culmination.
+
+import math
+import time
+from orbit import azimuth_compass, fetch_tle, load_satellite, look_angles, orbital_period
+
+STEPS_PER_ORBIT = 24
+TIME_TOLERANCE = 0.1  # seconds
+GOLDEN = (math.sqrt(5) - 1) / 2
+
+
+def bisect_crossing(f, t0, t1, f0, tol=TIME_TOLERANCE):
+    # f(t0) and f(t1) have opposite signs; f0 is f(t0)
+    while t1 - t0 > tol:
+        mid = (t0 + t1) / 2
+        f_mid = f(mid)
+        if (f_mid > 0) == (f0 > 0):
+            t0, f0 = mid, f_mid
+        else:
+            t1 = mid
+    return (t0 + t1) / 2
+
+
+def golden_max(f, a, b, tol=TIME_TOLERANCE):
+    c, d = b - GOLDEN * (b - a), a + GOLDEN * (b - a)
+    fc, fd = f(c), f(d)
+    while b - a > tol:
+        if fc > fd:
+            b, d, fd = d, c, fc
+            c = b - GOLDEN * (b - a)
+            fc = f(c)
+        else:
+            a, c, fc = c, d, fd
+            d = a + GOLDEN * (b - a)
+            fd = f(d)
+    return (a + b) / 2
+
+
+def find_pass_windows(elevation, start, end, period, min_el=0.0, tol=TIME_TOLERANCE):
+    # Returns (aos, tca, los) tuples for passes that rise and set inside [start, end]
+    def f(t):
+        return elevation(t) - min_el
+
+    step = period / STEPS_PER_ORBIT
+    n = int(math.ceil((end - start) / step))
+    times = [start + i * step for i in range(n + 1)]
+    values = [f(t) for t in times]
+
+    windows = []
+    aos = None
+    for i in range(n):
+        v0, v1 = values[i], values[i + 1]
+        if v0 <= 0 < v1:
+            aos = bisect_crossing(f, times[i], times[i + 1], v0, tol)
+        elif v0 > 0 >= v1 and aos is not None:
+            los = bisect_crossing(f, times[i], times[i + 1], v0, tol)
+            windows.append((aos, golden_max(f, aos, los, tol), los))
+            aos = None
+        elif (0 < i and values[i - 1] < v0 > v1 and v0 <= 0
+              and values[i - 1] <= 0 and v1 <= 0):
+            # Coarse peak below the mask: a short grazing pass may hide between samples
+            tca = golden_max(f, times[i - 1], times[i + 1], tol)
+            f_tca = f(tca)
+            if f_tca > 0:
+                windows.append((bisect_crossing(f, times[i - 1], tca, values[i - 1], tol),
+                                tca,
+                                bisect_crossing(f, tca, times[i + 1], f_tca, tol)))
+    return windows
+
+
+def predict_passes(sat, lat, lng, alt, start, days=2, min_el=10):
+    # Same shape as the N2YO radiopasses 'passes' list
+    def elevation(t):
+        return look_angles(sat, t, lat, lng, alt)[1]
+
+    passes = []
+    for aos, tca, los in find_pass_windows(elevation, start, start + days * 86400,
+                                           orbital_period(sat), min_el):
+        start_az, start_el = look_angles(sat, aos, lat, lng, alt)[:2]
+        max_az, max_el = look_angles(sat, tca, lat, lng, alt)[:2]
+        end_az, end_el = look_angles(sat, los, lat, lng, alt)[:2]
+        passes.append({
+            'startAz': round(start_az, 2), 'startAzCompass': azimuth_compass(start_az),
+            'startEl': round(start_el, 2), 'startUTC': aos,
+            'maxAz': round(max_az, 2), 'maxAzCompass': azimuth_compass(max_az),
+            'maxEl': round(max_el, 2), 'maxUTC': tca,
+            'endAz': round(end_az, 2), 'endAzCompass': azimuth_compass(end_az),
+            'endEl': round(end_el, 2), 'endUTC': los,
+        })
+    return passes
+
+
+def get_satellite_passes_local(norad_id, lat, lng, alt, days=2, min_el=10):
+    sat = load_satellite(*fetch_tle(norad_id))
+    passes = predict_passes(sat, lat, lng, alt, time.time(), days, min_el)
+    return {'info': {'satid': norad_id, 'passescount': len(passes)}, 'passes': passes}
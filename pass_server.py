@@ -0,0 +1,158 @@
+# Local pass-query HTTP service shared by every desktop/mobile client
+# Holds the N2YO key, coalesces identical in-flight requests and caches responses
+# Run: python pass_server.py --port 8080 [--source local]
+
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+import requests
+from aiohttp import web
+from station import API_KEY, BASE_URL, LAT, LNG, ALT, DAYS, MIN_EL
+
+CACHE_SIZE = 256
+CACHE_TTL = 15 * 60  # seconds
+ERROR_TTL = 60  # seconds an upstream failure is served from cache before retrying
+QUERY_LIMITS = {'lat': (-90, 90), 'lng': (-180, 180), 'alt': (-500, 9000),
+                'days': (1, 10), 'min_el': (0, 90)}  # days and min_el as N2YO accepts them
+
+
+class UpstreamError(Exception):
+    pass
+
+
+def fetch_n2yo(norad_id, lat, lng, alt, days, min_el):
+    url = f"{BASE_URL}/{norad_id}/{lat}/{lng}/{alt}/{days}/{min_el}/&apiKey={API_KEY}"
+    try:
+        response = requests.get(url, timeout=15)
+        if response.status_code != 200:
+            raise UpstreamError(f"Failed to retrieve data: {response.status_code}")
+        data = response.json()
+    except (requests.RequestException, ValueError) as e:
+        raise UpstreamError(f"Failed to retrieve data: {e}") from e
+    if 'passes' not in data:
+        raise UpstreamError(f"No passes data found: {data.get('info', 'No additional info')}")
+    return data
+
+
+def fetch_local(norad_id, lat, lng, alt, days, min_el):
+    from pass_finder import get_satellite_passes_local
+    try:
+        return get_satellite_passes_local(norad_id, lat, lng, alt, days, min_el)
+    except (requests.RequestException, ValueError) as e:
+        raise UpstreamError(f"Failed to predict passes: {e}") from e
+
+
+class TTLCache:
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL, clock=time.monotonic):
+        self.maxsize, self.ttl, self.clock = maxsize, ttl, clock
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self.clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, value, ttl=None):
+        entry = (self.clock() + (self.ttl if ttl is None else ttl), value)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def query_value(query, name, default, cast):
+    # nan fails both comparisons, so it is rejected along with out-of-range values
+    value = cast(query.get(name, default))
+    low, high = QUERY_LIMITS[name]
+    if not low <= value <= high:
+        raise ValueError(f"{name} must be between {low} and {high}")
+    return value
+
+
+class PassService:
+    def __init__(self, fetch=fetch_n2yo, cache=None):
+        self.fetch = fetch
+        self.cache = cache if cache is not None else TTLCache()
+        self.in_flight = {}
+        self.upstream_calls = 0
+
+    async def lookup(self, key):
+        # Returns (expires_at, (body, etag)); concurrent misses share one upstream call
+        entry = self.cache.get(key)
+        if entry is not None:
+            if isinstance(entry[1], UpstreamError):
+                raise entry[1].with_traceback(None)
+            return entry
+        future = self.in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._load(key))
+            self.in_flight[key] = future
+            future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _load(self, key):
+        self.upstream_calls += 1
+        try:
+            data = await asyncio.to_thread(self.fetch, *key)
+        except UpstreamError as e:
+            # Briefly remembered so an outage or quota error is not retried per request
+            self.cache.put(key, e, ERROR_TTL)
+            raise
+        body = json.dumps(data, separators=(',', ':')).encode()
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        return self.cache.put(key, (body, etag))
+
+    async def handle_passes(self, request):
+        try:
+            q = request.query
+            key = (int(request.match_info['norad_id']),
+                   query_value(q, 'lat', LAT, float), query_value(q, 'lng', LNG, float),
+                   query_value(q, 'alt', ALT, float),
+                   query_value(q, 'days', DAYS, int), query_value(q, 'min_el', MIN_EL, int))
+        except ValueError as e:
+            return web.json_response({'error': str(e)}, status=400)
+        try:
+            expires_at, (body, etag) = await self.lookup(key)
+        except UpstreamError as e:
+            return web.json_response({'error': str(e)}, status=502)
+        headers = {'ETag': etag,
+                   'Cache-Control': f"max-age={max(0, int(expires_at - self.cache.clock()))}"}
+        if_none_match = request.headers.get('If-None-Match', '')
+        if if_none_match.strip() == '*' or etag in [tag.strip() for tag in if_none_match.split(',')]:
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=body, content_type='application/json', headers=headers)
+
+    async def handle_stats(self, request):
+        return web.json_response({'cached': len(self.cache), 'in_flight': len(self.in_flight),
+                                  'upstream_calls': self.upstream_calls})
+
+
+def make_app(service=None):
+    service = service or PassService()
+    app = web.Application()
+    app['service'] = service
+    app.router.add_get('/passes/{norad_id}', service.handle_passes)
+    app.router.add_get('/stats', service.handle_stats)
+    return app
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Shared satellite pass query service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--source', choices=['n2yo', 'local'], default='n2yo')
+    args = parser.parse_args()
+    fetch = fetch_local if args.source == 'local' else fetch_n2yo
+    web.run_app(make_app(PassService(fetch)), host=args.host, port=args.port)
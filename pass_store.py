@@ -0,0 +1,101 @@
+# Columnar pass store with sorted-array interval queries
+# Passes are held as typed numpy columns sorted by AOS and split into buckets
+# of similar duration (powers of two). Every pass in a bucket is at least half
+# as long as the bucket's longest, so the passes active at t all start inside
+# [t - bucket max, t] and that slice holds few non-matches. Each query costs
+# one vectorized binary search over all buckets plus the matches, and one
+# unusually long pass only widens the search in its own bucket. A per-satellite ordering answers
+# "next pass of X" in O(log n). Query results index the store's own order;
+# source_index maps them back to the caller's input rows.
+
+import numpy as np
+
+COLUMNS = {
+    'norad_id': np.int32,
+    'aos': np.float64, 'tca': np.float64, 'los': np.float64,
+    'max_el': np.float32, 'start_az': np.float32, 'max_az': np.float32, 'end_az': np.float32,
+}
+KEY_SLACK = 1e-3  # seconds
+
+N2YO_FIELDS = {'aos': 'startUTC', 'tca': 'maxUTC', 'los': 'endUTC', 'max_el': 'maxEl',
+               'start_az': 'startAz', 'max_az': 'maxAz', 'end_az': 'endAz'}
+
+
+class PassStore:
+    def __init__(self, **columns):
+        aos = np.asarray(columns['aos'], dtype=np.float64)
+        los = np.asarray(columns['los'], dtype=np.float64)
+        # Rows without a usable AOS/LOS cannot be indexed and are dropped
+        valid = np.isfinite(aos) & np.isfinite(los) & (los >= aos)
+        order = np.flatnonzero(valid)[np.argsort(aos[valid], kind='stable')]
+        for name, dtype in COLUMNS.items():
+            setattr(self, name, np.asarray(columns[name], dtype=dtype)[order])
+        self.source_index = order
+        self.dropped = int((~valid).sum())
+        # Buckets are laid end to end in one sorted key array (bucket offset + AOS) so a
+        # single searchsorted call bounds the candidate slice of every bucket at once
+        duration = self.los - self.aos
+        bucket_of = np.floor(np.log2(np.maximum(duration, 1.0))).astype(int)
+        buckets, bucket_of = np.unique(bucket_of, return_inverse=True)
+        self._max_duration = np.zeros(len(buckets))
+        np.maximum.at(self._max_duration, bucket_of, duration)
+        self._origin = self.aos[0] if len(self) else 0.0
+        # Wider than any AOS offset plus search padding, so buckets never interleave
+        self._spacing = 2.0 ** np.ceil(np.log2(np.ptp(self.aos) + 2)) if len(self) else 1.0
+        self._members = np.lexsort((self.aos, bucket_of))
+        self._keys = (bucket_of[self._members] * self._spacing
+                      + (self.aos[self._members] - self._origin))
+        self._offsets = np.arange(len(buckets)) * self._spacing
+        self._by_sat = np.lexsort((self.aos, self.norad_id))
+        self._sat_keys = self.norad_id[self._by_sat]
+        self._sat_aos = self.aos[self._by_sat]
+
+    @classmethod
+    def from_passes(cls, passes):
+        # passes: iterable of (norad_id, N2YO-style pass dict); source_index is the
+        # position of each pass in that iterable
+        passes = list(passes)
+        columns = {'norad_id': [norad_id for norad_id, _ in passes]}
+        for name, field in N2YO_FIELDS.items():
+            columns[name] = [p.get(field, np.nan) for _, p in passes]
+        return cls(**columns)
+
+    def __len__(self):
+        return len(self.aos)
+
+    def _search(self, t0, t1, include_end):
+        # Bounds are padded by KEY_SLACK against key rounding, then checked exactly
+        low = np.clip(t0 - self._max_duration - KEY_SLACK - self._origin, -1, self._spacing - 1)
+        high = np.clip(t1 + KEY_SLACK - self._origin, -1, self._spacing - 1)
+        lo = np.searchsorted(self._keys, self._offsets + low)
+        hi = np.searchsorted(self._keys, self._offsets + high, side='right')
+        lengths = hi - lo
+        total = lengths.sum()
+        if not total:
+            return np.empty(0, dtype=np.intp)
+        starts = np.repeat(lo - (np.cumsum(lengths) - lengths), lengths)
+        candidates = self._members[starts + np.arange(total)]
+        ends = self.los[candidates]
+        hit = (ends >= t0 if include_end else ends > t0) & (self.aos[candidates] <= t1)
+        return np.sort(candidates[hit])
+
+    def active_at(self, t):
+        # Indices of passes with aos <= t < los
+        return self._search(t, t, include_end=False)
+
+    def overlapping(self, t0, t1):
+        # Indices of passes intersecting [t0, t1]
+        return self._search(t0, t1, include_end=True)
+
+    def next_pass(self, norad_id, t):
+        # Index of the first pass of norad_id with aos >= t, or None
+        key = self._sat_keys.dtype.type(norad_id)
+        lo = np.searchsorted(self._sat_keys, key, side='left')
+        hi = np.searchsorted(self._sat_keys, key, side='right')
+        i = lo + np.searchsorted(self._sat_aos[lo:hi], t, side='left')
+        return int(self._by_sat[i]) if i < hi else None
+
+    def record(self, i):
+        record = {name: getattr(self, name)[i].item() for name in COLUMNS}
+        record['source_index'] = int(self.source_index[i])
+        return record
@@ -4,13 +4,11 @@ import requests
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import datetime
+import os
 import pytz
+from station import API_KEY, BASE_URL, NORAD_IDS, SAT_FREQUENCIES, LAT, LNG, ALT, DAYS, MIN_EL
 
-API_KEY = 'NWCGC9-LK2RRA-VJAU5R-3GM5'
-BASE_URL = 'https://api.n2yo.com/rest/v1/satellite/radiopasses'
-NORAD_IDS = {'15': 25338, '18': 28654, '19': 33591}
-SAT_FREQUENCIES = {'15': '137.620 MHz', '18': '137.9125 MHz', '19': '137.100 MHz'}
-LAT, LNG, ALT = 39.9216, -75.1812, 12
+PASS_SERVICE_URL = os.environ.get('PASS_SERVICE_URL')  # e.g. http://127.0.0.1:8080, see pass_server.py
 
 sort_states = {}
 eastern_tz = pytz.timezone('America/New_York')
@@ -18,7 +16,10 @@ all_pass_data = {}
 canvas = None
 
 def get_satellite_passes(norad_id):
-    url = f"{BASE_URL}/{norad_id}/{LAT}/{LNG}/{ALT}/2/10/&apiKey={API_KEY}"
+    if PASS_SERVICE_URL:
+        url = f"{PASS_SERVICE_URL}/passes/{norad_id}?lat={LAT}&lng={LNG}&alt={ALT}&days={DAYS}&min_el={MIN_EL}"
+    else:
+        url = f"{BASE_URL}/{norad_id}/{LAT}/{LNG}/{ALT}/{DAYS}/{MIN_EL}/&apiKey={API_KEY}"
     response = requests.get(url)
     if response.status_code == 200:
         data = response.json()
@@ -78,26 +79,22 @@ def refresh_data():
                 max_time = datetime.datetime.fromtimestamp(p['maxUTC'], tz=datetime.timezone.utc).astimezone(eastern_tz).strftime('%I:%M %p')
                 end_time = datetime.datetime.fromtimestamp(p['endUTC'], tz=datetime.timezone.utc).astimezone(eastern_tz).strftime('%b %d %I:%M %p')
 
-                table.insert("", tk.END, values=(
+                item = table.insert("", tk.END, values=(
                     short_id, start_time,
                     f"{p.get('startAz', 0)}° ({p.get('startAzCompass', '')})",
                     f"{p.get('maxEl', 0)}° at {max_time}", end_time,
                     f"{p.get('endAz', 0)}° ({p.get('endAzCompass', '')})", best_pass
                 ), tags=(tag,))
 
-                key = (short_id, start_time)
-                if key not in all_pass_data:
-                    all_pass_data[key] = (short_id, [])
-                all_pass_data[key][1].append(p)
+                all_pass_data[item] = (short_id, [p])
 
 def on_select(event):
     global canvas
     selected_item = table.selection()
     if selected_item:
-        values = table.item(selected_item, "values")
-        sat_id, start_time = values[0], values[1]
-        if (sat_id, start_time) in all_pass_data:
-            short_id, pass_data = all_pass_data[(sat_id, start_time)]
+        item = selected_item[0]
+        if item in all_pass_data:
+            short_id, pass_data = all_pass_data[item]
             fig = plot_horizon(pass_data, short_id)
             if canvas:
                 canvas.get_tk_widget().destroy()
@@ -0,0 +1,18 @@
+# Ground station and satellite configuration shared by the tracker, services and capture
+
+import os
+
+API_KEY = os.environ.get('N2YO_API_KEY', 'NWCGC9-LK2RRA-VJAU5R-3GM5')
+BASE_URL = 'https://api.n2yo.com/rest/v1/satellite/radiopasses'
+NORAD_IDS = {'15': 25338, '18': 28654, '19': 33591}
+SAT_FREQUENCIES = {'15': '137.620 MHz', '18': '137.9125 MHz', '19': '137.100 MHz'}
+LAT, LNG, ALT = 39.9216, -75.1812, 12
+DAYS, MIN_EL = 2, 10
+
+
+def frequency_hz(frequency):
+    # '137.9125 MHz' -> 137912500
+    try:
+        return int(round(float(frequency.split()[0]) * 1e6))
+    except (ValueError, IndexError):
+        raise ValueError(f"Cannot parse frequency {frequency!r}") from None
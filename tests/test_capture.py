@@ -0,0 +1,92 @@
+import asyncio
+import shlex
+import sys
+import time
+import pytest
+from capture import CaptureOrchestrator
+from station import frequency_hz
+
+# Stands in for SatDump: runs far longer than any test pass, so LOS has to stop it
+STUB = f'{shlex.quote(sys.executable)} -c "import time; time.sleep(30)" {{device}} {{output}}'
+
+
+def make_pass(satellite, start, end):
+    return {'satellite': satellite, 'frequency': '137.100 MHz', 'startUTC': start, 'endUTC': end}
+
+
+def run(orchestrator, passes):
+    return {r['satellite']: r for r in asyncio.run(orchestrator.run(passes))}
+
+
+def test_overlapping_passes_share_device_pool(tmp_path):
+    now = time.time()
+    orchestrator = CaptureOrchestrator(STUB, ['sdr0', 'sdr1'], pre_roll=0, output_dir=tmp_path,
+                                       stop_grace=2)
+    results = run(orchestrator, [make_pass('15', now + 0.2, now + 1.0),
+                                 make_pass('18', now + 0.3, now + 1.0),
+                                 make_pass('19', now + 0.4, now + 2.0)])
+
+    assert {results['15']['device'], results['18']['device']} == {'sdr0', 'sdr1'}
+    # The third pass waits until one of the first two releases its device at LOS
+    assert results['19']['device'] in ('sdr0', 'sdr1')
+    assert results['19']['started'] >= now + 1.0
+    for r in results.values():
+        assert r['status'] == 'stopped'
+        assert r['returncode'] == -15
+
+
+def test_overrunning_capture_stops_at_los(tmp_path):
+    now = time.time()
+    orchestrator = CaptureOrchestrator(STUB, ['sdr0'], pre_roll=0, output_dir=tmp_path)
+    started = time.monotonic()
+    results = run(orchestrator, [make_pass('19', now + 0.1, now + 0.8)])
+
+    assert results['19']['status'] == 'stopped'
+    assert results['19']['returncode'] == -15
+    assert time.monotonic() - started < 5
+
+
+def test_pass_skipped_when_no_device_frees_before_los(tmp_path):
+    now = time.time()
+    orchestrator = CaptureOrchestrator(STUB, ['sdr0'], pre_roll=0, output_dir=tmp_path)
+    results = run(orchestrator, [make_pass('15', now + 0.1, now + 1.5),
+                                 make_pass('18', now + 0.3, now + 1.0)])
+
+    assert results['15']['status'] == 'stopped'
+    assert results['18']['status'] == 'skipped'
+    assert results['18']['device'] is None
+    assert results['18']['returncode'] is None
+
+
+def test_bad_pass_fails_alone(tmp_path):
+    now = time.time()
+    orchestrator = CaptureOrchestrator(STUB + ' {frequency_hz}', ['sdr0', 'sdr1'], pre_roll=0,
+                                       output_dir=tmp_path)
+    bad = make_pass('15', now + 0.1, now + 0.6)
+    bad['frequency'] = 'unknown'
+    results = run(orchestrator, [bad, make_pass('18', now + 0.1, now + 0.6)])
+
+    assert results['15']['status'].startswith('failed')
+    assert results['18']['status'] == 'stopped'
+
+
+def test_each_run_returns_only_its_own_results(tmp_path):
+    orchestrator = CaptureOrchestrator(STUB, ['sdr0'], pre_roll=0, output_dir=tmp_path)
+    now = time.time()
+    first = orchestrator.run([make_pass('15', now + 0.1, now + 0.4)])
+    assert [r['satellite'] for r in asyncio.run(first)] == ['15']
+    now = time.time()
+    second = orchestrator.run([make_pass('18', now + 0.1, now + 0.4)])
+    assert [r['satellite'] for r in asyncio.run(second)] == ['18']
+
+
+@pytest.mark.parametrize('command', ['echo {bogus}', 'echo "unterminated', 'echo {0}', ''])
+def test_invalid_template_rejected_at_startup(command):
+    with pytest.raises(ValueError):
+        CaptureOrchestrator(command, ['sdr0'])
+
+
+def test_frequency_hz():
+    assert frequency_hz('137.9125 MHz') == 137912500
+    with pytest.raises(ValueError):
+        frequency_hz('')
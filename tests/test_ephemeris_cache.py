@@ -0,0 +1,46 @@
+import os
+import numpy as np
+from ephemeris_cache import ChebyshevEphemeris, cache_path, load_or_fit
+from orbit import ecef_state, load_satellite, look_angles
+
+TLE = ('1 33591U 09005A   24100.51462315  .00000189  00000-0  12613-3 0  9991',
+       '2 33591  99.0461 132.3036 0013451 302.9690  57.0184 14.12997452786498')
+LAT, LNG, ALT = 39.9216, -75.1812, 12
+SAT = load_satellite(*TLE)
+START = (SAT.jdsatepoch - 2440587.5 + SAT.jdsatepochF) * 86400  # element epoch
+
+
+def test_scalar_time_gives_scalar_output():
+    ephemeris = ChebyshevEphemeris.fit(*TLE, START, START + 86400)
+    t = START + 12345.6
+
+    position, velocity = ephemeris.state(t)
+    assert position.shape == velocity.shape == (3,)
+    expected_position, expected_velocity = ecef_state(SAT, t)
+    assert np.allclose(position, expected_position, atol=1e-3)
+    assert np.allclose(velocity, expected_velocity, atol=1e-4)
+    assert ephemeris.position(t).shape == (3,)
+
+    angles = ephemeris.look_angles(t, LAT, LNG, ALT)
+    assert all(np.ndim(value) == 0 for value in angles)
+    assert np.allclose(angles, look_angles(SAT, t, LAT, LNG, ALT), atol=1e-4)
+    assert ephemeris.position([t]).shape == (1, 3)
+
+
+def test_uncovered_window_extends_cached_fit(tmp_path):
+    week = load_or_fit(*TLE, START, START + 7 * 86400, cache_dir=tmp_path)
+    assert load_or_fit(*TLE, START + 3600, START + 7200, cache_dir=tmp_path).end == week.end
+    extended = load_or_fit(*TLE, START + 6 * 86400, START + 8 * 86400, cache_dir=tmp_path)
+    assert extended.start == START and extended.end >= START + 8 * 86400
+    cached = ChebyshevEphemeris.load(cache_path(TLE[0], tmp_path))
+    assert (cached.start, cached.end) == (extended.start, extended.end)
+    assert [p.name for p in tmp_path.iterdir()] == [os.path.basename(cache_path(TLE[0], tmp_path))]
+
+
+def test_corrupt_cache_file_is_refitted(tmp_path):
+    path = cache_path(TLE[0], tmp_path)
+    with open(path, 'wb') as f:
+        f.write(b'PK\x03\x04 truncated')
+    ephemeris = load_or_fit(*TLE, START, START + 3600, cache_dir=tmp_path)
+    assert ephemeris.end >= START + 3600
+    assert ChebyshevEphemeris.load(path).end == ephemeris.end
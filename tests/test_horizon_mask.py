@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from horizon_mask import PassTracks, apply_horizon_mask, flat_mask, load_horizon_mask
+
+
+def make_tracks(*passes):
+    # passes: (az, el) sequences sampled every second, one pass after another
+    az = np.concatenate([np.asarray(p[0], dtype=float) for p in passes])
+    el = np.concatenate([np.asarray(p[1], dtype=float) for p in passes])
+    offsets = np.cumsum([0] + [len(p[0]) for p in passes])
+    return PassTracks(np.arange(len(az), dtype=float), az, el, offsets, 1.0)
+
+
+def test_mask_wraps_at_360(tmp_path):
+    path = tmp_path / 'horizon.txt'
+    path.write_text("# tree line to the north\n350 20\n10, 20\n180 0\n")
+    mask = load_horizon_mask(path)
+    # Both sides of north sit under the 20 degree points on either side of 0/360
+    tracks = make_tracks(([355, 0, 5, 90], [15, 15, 15, 15]))
+    clear = apply_horizon_mask(tracks, mask)
+    assert clear.aos.tolist() == [3.0]
+    assert clear.duration.tolist() == [1.0]
+
+
+def test_pass_never_clear():
+    tracks = make_tracks(([0, 10, 20], [5, 8, 5]), ([100, 110, 120], [5, 30, 5]))
+    clear = apply_horizon_mask(tracks, flat_mask(10))
+    assert np.isnan(clear.aos[0]) and np.isnan(clear.los[0]) and np.isnan(clear.max_el[0])
+    assert clear.duration[0] == 0
+    assert clear.aos[1] == clear.los[1] == 4.0
+    assert clear.max_el[1] == 30
+
+
+def test_pass_split_by_obstruction():
+    # A building between azimuth 40 and 60 hides the middle of the pass
+    mask = np.array([[0.0, 39.0, 40.0, 60.0, 61.0], [0.0, 0.0, 80.0, 80.0, 0.0]])
+    tracks = make_tracks(([20, 30, 40, 50, 60, 70, 80], [20, 30, 40, 50, 40, 30, 20]))
+    clear = apply_horizon_mask(tracks, mask, min_el=10)
+    assert clear.aos.tolist() == [0.0]
+    assert clear.los.tolist() == [6.0]
+    assert clear.duration.tolist() == [4.0]
+    assert clear.max_el.tolist() == [30.0]
+
+
+def test_mask_line_without_elevation(tmp_path):
+    path = tmp_path / 'horizon.txt'
+    path.write_text("0 5\n90\n")
+    with pytest.raises(ValueError, match=r'horizon.txt:2'):
+        load_horizon_mask(path)
@@ -0,0 +1,124 @@
+import asyncio
+import time
+from aiohttp.test_utils import TestClient, TestServer
+from pass_server import ERROR_TTL, PassService, TTLCache, UpstreamError, make_app
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class StubFetch:
+    # Stands in for N2YO: slow enough that concurrent requests overlap, and counts calls
+    def __init__(self, delay=0.2, error=None):
+        self.delay, self.error = delay, error
+        self.calls = []
+
+    def __call__(self, norad_id, lat, lng, alt, days, min_el):
+        self.calls.append((norad_id, lat, lng, alt, days, min_el))
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise UpstreamError(self.error)
+        return {'info': {'satid': norad_id}, 'passes': [{'startUTC': 1000, 'endUTC': 1600}]}
+
+
+def serve(service, scenario):
+    async def main():
+        async with TestClient(TestServer(make_app(service))) as client:
+            return await scenario(client)
+    return asyncio.run(main())
+
+
+def test_concurrent_misses_share_one_upstream_call():
+    fetch = StubFetch()
+    service = PassService(fetch)
+
+    async def scenario(client):
+        responses = await asyncio.gather(*(client.get(f'/passes/{norad_id}')
+                                           for _ in range(250) for norad_id in (28654, 33591)))
+        return [r.status for r in responses], {await r.read() for r in responses}
+
+    statuses, bodies = serve(service, scenario)
+    assert statuses == [200] * 500
+    assert len(bodies) == 2
+    assert sorted(call[0] for call in fetch.calls) == [28654, 33591]
+    assert not service.in_flight
+
+
+def test_cache_expires_after_ttl():
+    clock = Clock()
+    fetch = StubFetch(delay=0)
+    service = PassService(fetch, TTLCache(ttl=60, clock=clock))
+
+    async def scenario(client):
+        await client.get('/passes/33591')
+        clock.now = 59
+        await client.get('/passes/33591')
+        calls = len(fetch.calls)
+        clock.now = 61
+        await client.get('/passes/33591')
+        return calls
+
+    assert serve(service, scenario) == 1
+    assert len(fetch.calls) == 2
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, clock=Clock())
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a')[1] == 1
+    assert cache.get('c')[1] == 3
+    assert len(cache) == 2
+
+
+def test_if_none_match_returns_304():
+    service = PassService(StubFetch(delay=0))
+
+    async def scenario(client):
+        first = await client.get('/passes/33591')
+        etag = first.headers['ETag']
+        matched = await client.get('/passes/33591', headers={'If-None-Match': etag})
+        stale = await client.get('/passes/33591', headers={'If-None-Match': '"stale"'})
+        return matched.status, await matched.read(), matched.headers['ETag'], stale.status, etag
+
+    matched, body, etag, stale, first_etag = serve(service, scenario)
+    assert matched == 304
+    assert body == b''
+    assert etag == first_etag
+    assert stale == 200
+
+
+def test_upstream_failure_is_cached_briefly():
+    clock = Clock()
+    fetch = StubFetch(delay=0, error='quota exceeded')
+    service = PassService(fetch, TTLCache(clock=clock))
+
+    async def scenario(client):
+        statuses = [(await client.get('/passes/33591')).status for _ in range(5)]
+        clock.now = ERROR_TTL + 1
+        statuses.append((await client.get('/passes/33591')).status)
+        return statuses
+
+    assert serve(service, scenario) == [502] * 6
+    assert len(fetch.calls) == 2
+
+
+def test_invalid_queries_rejected_without_upstream_call():
+    fetch = StubFetch(delay=0)
+    service = PassService(fetch)
+    queries = ['lat=nan', 'lng=inf', 'alt=-inf', 'lat=500', 'lng=-181', 'days=-5', 'days=11',
+               'days=0', 'min_el=91', 'min_el=-1', 'lat=north']
+
+    async def scenario(client):
+        return [(await client.get(f'/passes/33591?{q}')).status for q in queries]
+
+    assert serve(service, scenario) == [400] * len(queries)
+    assert not fetch.calls
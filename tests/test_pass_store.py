@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from pass_store import PassStore
+
+
+def random_columns(rng, n, long_passes=0):
+    aos = rng.uniform(0, 30 * 86400, n)
+    los = aos + rng.uniform(60, 960, n)
+    los[:long_passes] += 20 * 86400
+    zeros = np.zeros(n)
+    return {'norad_id': rng.integers(0, 20, n), 'aos': aos, 'tca': aos, 'los': los,
+            'max_el': zeros, 'start_az': zeros, 'max_az': zeros, 'end_az': zeros}
+
+
+@pytest.mark.parametrize('long_passes', [0, 3])
+def test_queries_match_brute_force(long_passes):
+    rng = np.random.default_rng(1)
+    columns = random_columns(rng, 20_000, long_passes)
+    store = PassStore(**columns)
+    aos, los, norad_id = columns['aos'], columns['los'], columns['norad_id']
+    for t in rng.uniform(-86400, 31 * 86400, 200):
+        assert sorted(store.aos[store.active_at(t)]) == sorted(aos[(aos <= t) & (los > t)])
+        t1 = t + rng.uniform(0, 7200)
+        assert sorted(store.aos[store.overlapping(t, t1)]) == sorted(aos[(aos <= t1) & (los >= t)])
+        sat = int(rng.integers(0, 20))
+        i = store.next_pass(sat, t)
+        later = aos[(norad_id == sat) & (aos >= t)]
+        assert (i is None and not len(later)) or store.aos[i] == later.min()
+
+
+def test_rows_without_los_are_dropped():
+    store = PassStore.from_passes([(1, {'startUTC': 100, 'endUTC': 200}), (1, {'startUTC': 300})])
+    assert len(store) == 1
+    assert store.dropped == 1
+    assert store.active_at(150).tolist() == [0]
+    assert store.overlapping(0, 1000).tolist() == [0]
+
+
+def test_source_index_maps_back_to_input_rows():
+    passes = [(19, {'startUTC': 500, 'endUTC': 900}), (15, {'startUTC': 300}),
+              (18, {'startUTC': 100, 'endUTC': 400})]
+    store = PassStore.from_passes(passes)
+    assert [passes[j][0] for j in store.source_index] == store.norad_id.tolist() == [18, 19]
+    i = store.next_pass(19, 0)
+    assert store.record(i)['source_index'] == 0
+    assert passes[store.source_index[i]][1]['startUTC'] == 500
+
+
+def test_empty_store():
+    store = PassStore.from_passes([])
+    assert store.active_at(0).tolist() == []
+    assert store.overlapping(0, 1).tolist() == []
+    assert store.next_pass(1, 0) is None